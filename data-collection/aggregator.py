@@ -1,22 +1,36 @@
-import json
+import asyncio
+import orjson
 import sys
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Dict, Any
+from typing import Any, Dict, Optional, Tuple
 import os
-from extract_weather import extract_weather
-from extract_prayer_times import extract_prayer_times
-PRAYER_TIMES_AVAILABLE = True
+import aiohttp
+from config import PRAYER_TIMES_AVAILABLE
+from extract_weather import extract_weather_async
+from extract_prayer_times import extract_prayer_times_async
 
-# Load environment variables from .env file if it exists
-env_path = Path(__file__).parent / '.env'
-if env_path.exists():
-    with open(env_path) as f:
-        for line in f:
-            line = line.strip()
-            if line and not line.startswith('#') and '=' in line:
-                key, value = line.split('=', 1)
-                os.environ[key] = value
+
+async def _gather_all(location: str) -> Tuple[Optional[Dict], Optional[Dict]]:
+    """
+    Fetch prayer times and weather concurrently over one shared session.
+
+    The session pools connections and caches DNS lookups, so the total
+    wall-clock time is roughly the slowest single request instead of the
+    sum of all round trips.
+
+    Returns:
+        (prayer_times, weather) tuple; either element may be None on failure
+    """
+    connector = aiohttp.TCPConnector(limit=10, ttl_dns_cache=300)
+    timeout = aiohttp.ClientTimeout(total=10)
+    async with aiohttp.ClientSession(connector=connector, timeout=timeout) as session:
+        if PRAYER_TIMES_AVAILABLE:
+            return await asyncio.gather(
+                extract_prayer_times_async(session),
+                extract_weather_async(session, city=location)
+            )
+        return None, await extract_weather_async(session, city=location)
 
 
 def aggregate_data(location: str = None) -> Dict[str, Any]:
@@ -36,20 +50,22 @@ def aggregate_data(location: str = None) -> Dict[str, Any]:
     # Calculate next update time (next day at 6 AM)
     next_update = (now + timedelta(days=1)).replace(hour=6, minute=0, second=0, microsecond=0)
     
-    # Initialize data structure
+    # Initialize data structure (one strftime per timestamp, second precision)
     aggregated_data = {
-        'timestamp': now.isoformat(),
+        'timestamp': now.strftime('%Y-%m-%dT%H:%M:%S'),
         'location': location,
-        'next_update': next_update.isoformat(),
+        'next_update': next_update.strftime('%Y-%m-%dT%H:%M:%S'),
         'prayer_times': {},
         'weather': {},
         'status': 'success'
     }
     
-    # Extract prayer times (if available)
+    # Fetch all data sources concurrently
+    print("Extracting prayer times and weather data...")
+    prayer_times, weather = asyncio.run(_gather_all(location))
+
+    # Prayer times (if available)
     if PRAYER_TIMES_AVAILABLE:
-        print("Extracting prayer times...")
-        prayer_times = extract_prayer_times()
         if prayer_times:
             aggregated_data['prayer_times'] = prayer_times
             print("✓ Prayer times extracted successfully")
@@ -58,10 +74,8 @@ def aggregate_data(location: str = None) -> Dict[str, Any]:
             print("✗ Failed to extract prayer times")
     else:
         print("⊘ Skipping prayer times (module not available)")
-    
-    # Extract weather data
-    print("Extracting weather data...")
-    weather = extract_weather(city=location)
+
+    # Weather data
     if weather:
         aggregated_data['weather'] = weather
         print("✓ Weather data extracted successfully")
@@ -88,9 +102,12 @@ def save_to_file(data: Dict[str, Any], output_path = None) -> bool:
         print(f"[DEBUG] Preparing to save file: {output_file}")
         output_file.parent.mkdir(parents=True, exist_ok=True)
         print(f"[DEBUG] Directory ensured: {output_file.parent.resolve()}")
-        # Write JSON file with pretty formatting
-        with open(output_file, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
+        # Write JSON file with pretty formatting (orjson emits UTF-8 bytes
+        # directly). Write to a sibling temp file and atomically swap it in,
+        # so the display frontend never sees a half-written or corrupt file.
+        tmp_file = output_file.with_suffix('.json.tmp')
+        tmp_file.write_bytes(orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_APPEND_NEWLINE))
+        os.replace(tmp_file, output_file)
         print(f"\n✓ Data saved to {output_file}")
         print(f"[DEBUG] File write complete: {output_file.resolve()}")
         return True
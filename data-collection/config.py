@@ -0,0 +1,27 @@
+"""
+Shared configuration for the data-collection scripts.
+
+Importing this module loads the local .env file (if present) exactly once
+per process, so aggregator.py can be imported as a library without
+re-running the loader.
+"""
+import os
+from pathlib import Path
+from typing import Dict
+
+PRAYER_TIMES_AVAILABLE = True
+
+
+def _load_env(path: Path) -> Dict[str, str]:
+    """Parse a simple KEY=VALUE .env file into a dict in one pass."""
+    return dict(
+        line.split('=', 1)
+        for line in (raw.strip() for raw in path.read_text().splitlines())
+        if line and not line.startswith('#') and '=' in line
+    )
+
+
+# Load environment variables from .env file if it exists
+env_path = Path(__file__).parent / '.env'
+if env_path.exists():
+    os.environ.update(_load_env(env_path))
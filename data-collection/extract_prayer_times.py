@@ -1,16 +1,109 @@
-from bs4 import BeautifulSoup
-import requests
-import json
+import aiohttp
+import asyncio
+import orjson
 import re
-from typing import Dict, Optional
+from typing import Dict, List, Optional
 from datetime import datetime
 import os
+from http_cache import cached_get
 
+# Marker preceding the embedded JSON config in the Mawaqit page
+_CONF_MARKER = 'let confData = '
 
-def extract_prayer_times(url: str = None) -> Optional[Dict[str, str]]:
+
+def _extract_conf_json(html: str) -> Optional[str]:
+    """
+    Locate the confData JSON object embedded in the page.
+
+    A single forward scan counting braces - unlike a lazy DOTALL regex,
+    this never backtracks over the multi-hundred-KB document.
+    """
+    start = html.find(_CONF_MARKER)
+    if start == -1:
+        return None
+    start += len(_CONF_MARKER)
+    if start >= len(html) or html[start] != '{':
+        return None
+    depth = 0
+    for i in range(start, len(html)):
+        c = html[i]
+        if c == '{':
+            depth += 1
+        elif c == '}':
+            depth -= 1
+            if depth == 0:
+                return html[start:i + 1]
+    return None
+
+
+def _extract_month_json(conf_json: str, month_index: int) -> Optional[str]:
+    """
+    Slice one month's calendar object out of the confData JSON string.
+
+    The calendar holds 12 months x ~30 days but only today's entry is
+    ever read; decoding just the wanted month skips ~12x the JSON work.
+    """
+    start = conf_json.find('"calendar"')
+    if start == -1:
+        return None
+    pos = conf_json.find('[', start)
+    if pos == -1:
+        return None
+    obj_start = obj_end = -1
+    for _ in range(month_index + 1):
+        obj_start = conf_json.find('{', pos)
+        if obj_start == -1:
+            return None
+        depth = 0
+        obj_end = -1
+        for i in range(obj_start, len(conf_json)):
+            c = conf_json[i]
+            if c == '{':
+                depth += 1
+            elif c == '}':
+                depth -= 1
+                if depth == 0:
+                    obj_end = i
+                    break
+        if obj_end == -1:
+            return None
+        pos = obj_end + 1
+    return conf_json[obj_start:obj_end + 1]
+
+
+def _extract_day_times(month_json: str, day_str: str) -> Optional[List[str]]:
+    """
+    Pull a single day's times array out of a month object string.
+
+    Only ~6 values are ever read, so decoding the other ~30 days of the
+    month is skipped; day_str comes from str(now.day) and is regex-safe.
+    """
+    match = re.search(rf'"{day_str}"\s*:\s*\[([^\]]*)\]', month_json)
+    if match is None:
+        return None
+    try:
+        return orjson.loads(f'[{match.group(1)}]')
+    except ValueError:
+        return None
+
+
+async def _fetch_text(session: aiohttp.ClientSession, url: str) -> str:
+    """Fetch a URL and return the response body as text.
+
+    The prayer-time calendar covers the whole day, so the cached
+    Mawaqit page stays valid for 24 hours.
+    """
+    return await cached_get(session, url, ttl=86400)
+
+
+async def extract_prayer_times_async(session: aiohttp.ClientSession, url: str = None) -> Optional[Dict[str, str]]:
     """
     Extract prayer times from Mawaqit website.
-    
+
+    Args:
+        session: Shared aiohttp session (connection pooling / DNS cache)
+        url: The Mawaqit mosque page URL (defaults to PRAYER_TIMES_URL env var)
+
     Returns:
         Dict with prayer names and times, or None if extraction fails
     """
@@ -18,47 +111,57 @@ def extract_prayer_times(url: str = None) -> Optional[Dict[str, str]]:
         url = os.environ.get('PRAYER_TIMES_URL')
     try:
         # Fetch the page
-        response = requests.get(url, timeout=10)
-        response.raise_for_status()
-        
-        # Extract the confData JSON from the script tag
-        script_content = response.text
-        
+        script_content = await _fetch_text(session, url)
+
         # Find the confData JSON
-        conf_data_match = re.search(r'let confData = ({.*?});', script_content, re.DOTALL)
-        
-        if conf_data_match:
-            json_str = conf_data_match.group(1)
-            conf_data = json.loads(json_str)
-            
+        json_str = _extract_conf_json(script_content)
+
+        if json_str:
+            prayer_names = ['fajr', 'shuruq', 'dhuhr', 'asr', 'maghrib', 'isha']
+
+            # Use system clock (controlled by TZ env var in workflow)
+            now = datetime.now()
+            month_index = now.month - 1  # Calendar is 0-indexed
+            day_str = str(now.day)
+            print(f"[DEBUG] Fetching prayer times for local date: {now.strftime('%Y-%m-%d %H:%M:%S')}")
+
             # Extract from calendar - contains astronomical times
             # Calendar structure: month (0-indexed) -> day (string) -> [fajr, shuruq, dhuhr, asr, maghrib, isha]
-            calendar = conf_data.get('calendar', [])
-            prayer_names = ['fajr', 'shuruq', 'dhuhr', 'asr', 'maghrib', 'isha']
-            
-            prayer_times = {}
-            if calendar:
-                # Use system clock (controlled by TZ env var in workflow)
-                now = datetime.now()
-                month_index = now.month - 1  # Calendar is 0-indexed
-                day_str = str(now.day)
-                print(f"[DEBUG] Fetching prayer times for local date: {now.strftime('%Y-%m-%d %H:%M:%S')}")
-                
-                if month_index < len(calendar) and day_str in calendar[month_index]:
-                    day_times = calendar[month_index][day_str]
-                    for name, time in zip(prayer_names, day_times):
-                        prayer_times[name] = time
-            
-            return prayer_times
+            # Slice out just today's entry instead of decoding all 12 months
+            month_json = _extract_month_json(json_str, month_index)
+            day_times = _extract_day_times(month_json, day_str) if month_json is not None else None
+
+            if day_times is None:
+                # Fallback: decode the full config and index into it
+                calendar = orjson.loads(json_str).get('calendar', [])
+                month_days = calendar[month_index] if month_index < len(calendar) else {}
+                day_times = month_days.get(day_str, [])
+
+            return dict(zip(prayer_names, day_times))
         else:
             print("Could not find prayer times data in the page.")
             return None
-            
+
     except Exception as e:
         print(f"Error extracting prayer times: {e}")
         return None
 
 
+def extract_prayer_times(url: str = None) -> Optional[Dict[str, str]]:
+    """
+    Synchronous wrapper around extract_prayer_times_async for standalone use.
+
+    Returns:
+        Dict with prayer names and times, or None if extraction fails
+    """
+    async def _run():
+        timeout = aiohttp.ClientTimeout(total=10)
+        async with aiohttp.ClientSession(timeout=timeout) as session:
+            return await extract_prayer_times_async(session, url)
+
+    return asyncio.run(_run())
+
+
 if __name__ == "__main__":
     # Test the extraction
     result = extract_prayer_times()
@@ -67,4 +170,4 @@ if __name__ == "__main__":
         for name, time in result.items():
             print(f"{name.capitalize()}: {time}")
     else:
-        print("Failed to extract prayer times")
\ No newline at end of file
+        print("Failed to extract prayer times")
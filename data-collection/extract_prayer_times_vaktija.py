@@ -1,8 +1,15 @@
 import requests
-import json
+from requests.adapters import HTTPAdapter, Retry
+import orjson
 import re
 from typing import Dict, Optional
 
+# Module-level session: keeps the TCP+TLS connection alive between calls
+# instead of paying a fresh handshake for every request
+_SESSION = requests.Session()
+_SESSION.mount('https://', HTTPAdapter(pool_connections=2, pool_maxsize=4,
+                                       max_retries=Retry(total=2, backoff_factor=0.3)))
+
 
 def extract_prayer_times_vaktija(url: str = 'https://vaktija.eu/de/stuttgart') -> Optional[Dict[str, str]]:
     """
@@ -19,7 +26,7 @@ def extract_prayer_times_vaktija(url: str = 'https://vaktija.eu/de/stuttgart') -
         headers = {
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
         }
-        response = requests.get(url, headers=headers, timeout=10)
+        response = _SESSION.get(url, headers=headers, timeout=10)
         response.raise_for_status()
         
         # Extract the Data JSON from the script
@@ -31,7 +38,7 @@ def extract_prayer_times_vaktija(url: str = 'https://vaktija.eu/de/stuttgart') -
         
         if data_match:
             json_str = data_match.group(1)
-            data = json.loads(json_str)
+            data = orjson.loads(json_str)
             
             # Structure:
             # data['v'] = array of arrays, each containing times for one day
@@ -44,9 +51,7 @@ def extract_prayer_times_vaktija(url: str = 'https://vaktija.eu/de/stuttgart') -
             if times_array and len(times_array) > 0:
                 today_times = times_array[0]  # First entry is today
                 
-                prayer_times = {}
-                for name, time in zip(prayer_names, today_times):
-                    prayer_times[name] = time
+                prayer_times = dict(zip(prayer_names, today_times))
                 
                 # Also extract location if available
                 location_id = data.get('locationId')
@@ -62,7 +67,7 @@ def extract_prayer_times_vaktija(url: str = 'https://vaktija.eu/de/stuttgart') -
             print("Could not find Data variable in the page.")
             return None
             
-    except json.JSONDecodeError as e:
+    except orjson.JSONDecodeError as e:
         print(f"Error parsing JSON: {e}")
         return None
     except Exception as e:
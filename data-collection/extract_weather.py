@@ -1,73 +1,187 @@
-import requests
+import aiohttp
+import asyncio
+import orjson
 import os
+import time
 from typing import Dict, Optional, List
-from datetime import datetime
-from collections import defaultdict
+from datetime import datetime, timezone
+from collections import Counter, defaultdict
+from http_cache import CACHE_DIR, cached_get
 
+BASE_URL = "http://api.openweathermap.org/data/2.5"
+GEO_URL = "http://api.openweathermap.org/geo/1.0/direct"
+ONECALL_URL = "https://api.openweathermap.org/data/3.0/onecall"
 
-def extract_weather(city: str = None, country_code: str = "DE", api_key: Optional[str] = None) -> Optional[Dict]:
+
+async def _fetch_json(session: aiohttp.ClientSession, url: str,
+                      params: Dict = None, ttl: int = 600) -> Dict:
+    """Fetch a URL through the TTL cache and decode the JSON body."""
+    body = await cached_get(session, url, params=params, ttl=ttl)
+    return orjson.loads(body)
+
+
+async def _resolve_city(session: aiohttp.ClientSession, city: str,
+                        country_code: str, api_key: str) -> Optional[tuple]:
+    """
+    Resolve a city name to (lat, lon) via the geocoding API.
+
+    Coordinates never change for a given name, so the result is memoized
+    to a small file; subsequent runs skip the lookup and the server-side
+    name matching that q=city,cc would force on every weather request.
+    """
+    geo_file = CACHE_DIR / f"geo_{city}_{country_code}.json"
+    if geo_file.exists():
+        try:
+            cached = orjson.loads(geo_file.read_bytes())
+            return cached['lat'], cached['lon']
+        except (ValueError, KeyError):
+            pass  # Corrupt memo file - re-resolve
+
+    params = {'q': f"{city},{country_code}", 'limit': 1, 'appid': api_key}
+    async with session.get(GEO_URL, params=params) as response:
+        response.raise_for_status()
+        results = await response.json()
+    if not results:
+        return None
+
+    lat, lon = results[0]['lat'], results[0]['lon']
+    try:
+        CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        geo_file.write_bytes(orjson.dumps({'lat': lat, 'lon': lon}))
+    except OSError as e:
+        print(f"Warning: could not write geo cache file {geo_file}: {e}")
+    return lat, lon
+
+
+async def _extract_onecall(session: aiohttp.ClientSession, lat: float,
+                           lon: float, api_key: str) -> Dict:
+    """
+    Fetch current weather and daily forecast in a single One Call request.
+
+    The daily array already carries per-day min/max, so no grouping over
+    3-hour samples is needed.
+    """
+    data = await _fetch_json(session, ONECALL_URL, params={
+        'lat': lat,
+        'lon': lon,
+        'exclude': 'minutely,hourly,alerts',
+        'appid': api_key,
+        'units': 'metric'
+    }, ttl=600)
+
+    cur = data['current']
+    weather = cur['weather'][0]
+    current = {
+        'temperature': round(cur['temp']),
+        'feels_like': round(cur['feels_like']),
+        'humidity': cur['humidity'],
+        'condition': weather['main'],
+        'description': weather['description'],
+        'icon': weather['icon'],
+        'wind_speed': round(cur['wind_speed'], 1),
+        'sunrise': cur['sunrise'],
+        'sunset': cur['sunset']
+    }
+
+    offset = data.get('timezone_offset', 0)
+    forecast = [{
+        'date': datetime.fromtimestamp(d['dt'] + offset, tz=timezone.utc).strftime('%Y-%m-%d'),
+        'high': round(d['temp']['max']),
+        'low': round(d['temp']['min']),
+        'condition': d['weather'][0]['main']
+    } for d in data['daily'][1:4]]
+
+    return {
+        'current': current,
+        'forecast': forecast
+    }
+
+
+async def extract_weather_async(session: aiohttp.ClientSession, city: str = None,
+                                country_code: str = "DE", api_key: Optional[str] = None) -> Optional[Dict]:
     """
     Extract current weather and 3-day forecast from OpenWeatherMap API.
-    
+
+    Tries the One Call endpoint first (one round trip for everything);
+    keys without a One Call subscription fall back to the free-tier
+    current-weather and forecast endpoints, fetched concurrently so the
+    wall-clock cost is still a single round trip.
+
     Args:
+        session: Shared aiohttp session (connection pooling / DNS cache)
         city: City name (defaults to LOCATION env var or "My City")
         country_code: ISO 3166 country code
         api_key: OpenWeatherMap API key (or set OPENWEATHER_API_KEY env variable)
-    
+
     Returns:
         Dict with current weather and forecast, or None if extraction fails
     """
     if city is None:
         city = os.environ.get('LOCATION', 'My City')
-    
+
     # Get API key from parameter or environment variable
     if api_key is None:
         api_key = os.environ.get('OPENWEATHER_API_KEY')
-    
+
     if not api_key:
         print("Error: No API key provided. Set OPENWEATHER_API_KEY environment variable.")
         return None
-    
+
     try:
-        base_url = "http://api.openweathermap.org/data/2.5"
+        # Prefer One Call: a single round trip covers current conditions
+        # plus the daily forecast. The 3.0 endpoint needs its own
+        # subscription, so free-tier keys (401/403) fall back to the
+        # /weather + /forecast pair below.
+        try:
+            coords = await _resolve_city(session, city, country_code, api_key)
+            if coords is not None:
+                return await _extract_onecall(session, coords[0], coords[1], api_key)
+        except aiohttp.ClientResponseError as e:
+            if e.status not in (401, 403):
+                raise
+        except TimeoutError:
+            # Slow geocode/One Call answer - try the free-tier pair instead
+            print("One Call request timed out, falling back to /weather + /forecast")
+
         params = {
             'q': f"{city},{country_code}",
             'appid': api_key,
             'units': 'metric'
         }
-        
-        # Fetch current weather
-        current_response = requests.get(f"{base_url}/weather", params=params, timeout=10)
-        current_response.raise_for_status()
-        current_data = current_response.json()
-        
-        # Fetch 5-day forecast
-        forecast_response = requests.get(f"{base_url}/forecast", params=params, timeout=10)
-        forecast_response.raise_for_status()
-        forecast_data = forecast_response.json()
-        
+
+        # Fetch current weather and 5-day forecast in parallel.
+        # Current conditions refresh roughly every 10 minutes, the
+        # forecast roughly hourly - cache accordingly.
+        current_data, forecast_data = await asyncio.gather(
+            _fetch_json(session, f"{BASE_URL}/weather", params=params, ttl=600),
+            _fetch_json(session, f"{BASE_URL}/forecast", params=params, ttl=3600),
+        )
+
         # Extract current weather
+        main = current_data['main']
+        weather = current_data['weather'][0]
         current = {
-            'temperature': round(current_data['main']['temp']),
-            'feels_like': round(current_data['main']['feels_like']),
-            'humidity': current_data['main']['humidity'],
-            'condition': current_data['weather'][0]['main'],
-            'description': current_data['weather'][0]['description'],
-            'icon': current_data['weather'][0]['icon'],
+            'temperature': round(main['temp']),
+            'feels_like': round(main['feels_like']),
+            'humidity': main['humidity'],
+            'condition': weather['main'],
+            'description': weather['description'],
+            'icon': weather['icon'],
             'wind_speed': round(current_data['wind']['speed'], 1),
             'sunrise': current_data['sys']['sunrise'],
             'sunset': current_data['sys']['sunset']
         }
-        
+
         # Process forecast - group by day and find high/low
         forecast = _process_forecast(forecast_data['list'], days=3)
-        
+
         return {
             'current': current,
             'forecast': forecast
         }
-        
-    except requests.exceptions.RequestException as e:
+
+    except (aiohttp.ClientError, TimeoutError) as e:
+        # ClientTimeout expiry raises TimeoutError, not aiohttp.ClientError
         print(f"Error fetching weather data: {e}")
         return None
     except (KeyError, ValueError) as e:
@@ -75,45 +189,61 @@ def extract_weather(city: str = None, country_code: str = "DE", api_key: Optiona
         return None
 
 
+def extract_weather(city: str = None, country_code: str = "DE", api_key: Optional[str] = None) -> Optional[Dict]:
+    """
+    Synchronous wrapper around extract_weather_async for standalone use.
+
+    Returns:
+        Dict with current weather and forecast, or None if extraction fails
+    """
+    async def _run():
+        timeout = aiohttp.ClientTimeout(total=10)
+        async with aiohttp.ClientSession(timeout=timeout) as session:
+            return await extract_weather_async(session, city=city, country_code=country_code, api_key=api_key)
+
+    return asyncio.run(_run())
+
+
 def _process_forecast(forecast_list: List[Dict], days: int = 3) -> List[Dict]:
     """
     Process forecast data to get daily high/low temperatures.
-    
+
     The API returns data every 3 hours. We group by day and find min/max.
     """
-    daily_data = defaultdict(lambda: {'temps': [], 'conditions': []})
-    today = datetime.now().date()
-    
+    # Per day: [running high, running low, condition counter]
+    daily = defaultdict(lambda: [float('-inf'), float('inf'), Counter()])
+
+    # Bucket by local calendar day with integer epoch-day arithmetic;
+    # fromtimestamp + strftime per item cost far more than the int ops.
+    utc_offset = int(datetime.now().astimezone().utcoffset().total_seconds())
+    today = (int(time.time()) + utc_offset) // 86400
+
     for item in forecast_list:
-        # Parse timestamp
-        dt = datetime.fromtimestamp(item['dt'])
-        date_str = dt.strftime('%Y-%m-%d')
-        
+        day = (item['dt'] + utc_offset) // 86400
+
         # Skip today, we want future days
-        if dt.date() == today:
+        if day == today:
             continue
-        
-        daily_data[date_str]['temps'].append(item['main']['temp'])
-        daily_data[date_str]['conditions'].append(item['weather'][0]['main'])
-    
-    # Build forecast for next 3 days
+
+        bucket = daily[day]
+        temp = item['main']['temp']
+        if temp > bucket[0]:
+            bucket[0] = temp
+        if temp < bucket[1]:
+            bucket[1] = temp
+        bucket[2][item['weather'][0]['main']] += 1
+
+    # Build forecast for next 3 days; only these few buckets get formatted
     forecast = []
-    for date_str in sorted(daily_data.keys())[:days]:
-        data = daily_data[date_str]
-        
-        # Find most common condition (mode)
-        condition_counts = {}
-        for c in data['conditions']:
-            condition_counts[c] = condition_counts.get(c, 0) + 1
-        main_condition = max(condition_counts, key=condition_counts.get)
-        
+    for day in sorted(daily)[:days]:
+        high, low, conditions = daily[day]
         forecast.append({
-            'date': date_str,
-            'high': round(max(data['temps'])),
-            'low': round(min(data['temps'])),
-            'condition': main_condition
+            'date': datetime.fromtimestamp(day * 86400, tz=timezone.utc).strftime('%Y-%m-%d'),
+            'high': round(high),
+            'low': round(low),
+            'condition': conditions.most_common(1)[0][0]
         })
-    
+
     return forecast
 
 
@@ -127,7 +257,7 @@ if __name__ == "__main__":
         print(f"Condition: {current['condition']} - {current['description']}")
         print(f"Humidity: {current['humidity']}%")
         print(f"Wind Speed: {current['wind_speed']} m/s")
-        
+
         print("\n=== 3-Day Forecast ===")
         for day in result['forecast']:
             print(f"{day['date']}: {day['low']}°C - {day['high']}°C, {day['condition']}")
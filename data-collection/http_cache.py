@@ -0,0 +1,90 @@
+import hashlib
+import orjson
+import time
+from pathlib import Path
+from typing import Dict, Optional
+from urllib.parse import urlencode
+
+import aiohttp
+
+# Cached response bodies live next to the generated display data
+CACHE_DIR = Path(__file__).parent / "output" / ".cache"
+
+
+def _cache_path(url: str, params: Optional[Dict] = None) -> Path:
+    """Map (url, params) to a stable cache file name."""
+    query = urlencode(sorted(params.items())) if params else ''
+    key = hashlib.sha1(f"{url}?{query}".encode()).hexdigest()
+    return CACHE_DIR / f"{key}.json"
+
+
+async def cached_get(session: aiohttp.ClientSession, url: str,
+                     params: Optional[Dict] = None, ttl: int = 600) -> str:
+    """
+    GET a URL through a small on-disk TTL cache.
+
+    Re-runs within the TTL window (dev iterations, cron jitter) return the
+    cached body without touching the network, which keeps us well inside
+    OpenWeather's free-tier rate limits and skips re-downloading the
+    multi-hundred-KB Mawaqit page.
+
+    Expired entries are revalidated with If-None-Match / If-Modified-Since
+    when the server supplied an ETag or Last-Modified; a 304 answer reuses
+    the cached body, so unchanged pages cost near-zero bytes on the wire.
+
+    Args:
+        session: Shared aiohttp session
+        url: Request URL
+        params: Optional query parameters (part of the cache key)
+        ttl: How long the cached body stays valid, in seconds
+
+    Returns:
+        The response body as text
+    """
+    cache_file = _cache_path(url, params)
+    payload = None
+    if cache_file.exists():
+        try:
+            payload = orjson.loads(cache_file.read_bytes())
+            if payload['expires'] > time.time():
+                return payload['body']
+        except (ValueError, KeyError):
+            payload = None  # Corrupt cache entry - fall through and refetch
+
+    # Ask the server to skip the body if the expired entry is still current
+    headers = {}
+    if payload is not None:
+        if payload.get('etag'):
+            headers['If-None-Match'] = payload['etag']
+        if payload.get('last_modified'):
+            headers['If-Modified-Since'] = payload['last_modified']
+
+    async with session.get(url, params=params, headers=headers or None) as response:
+        if response.status == 304 and payload is not None:
+            body = payload['body']
+            status = payload.get('status', 200)
+            etag = payload.get('etag')
+            last_modified = payload.get('last_modified')
+        else:
+            response.raise_for_status()
+            # Decode the raw bytes as UTF-8 ourselves: both APIs serve
+            # UTF-8, and this sidesteps response.text()'s charset
+            # detection plus any mis-declared Content-Type charset
+            body = (await response.read()).decode('utf-8', errors='replace')
+            status = response.status
+            etag = response.headers.get('ETag')
+            last_modified = response.headers.get('Last-Modified')
+
+    try:
+        CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        cache_file.write_bytes(orjson.dumps({
+            'expires': time.time() + ttl,
+            'status': status,
+            'etag': etag,
+            'last_modified': last_modified,
+            'body': body
+        }))
+    except OSError as e:
+        print(f"Warning: could not write cache file {cache_file}: {e}")
+
+    return body